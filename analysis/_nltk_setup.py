@@ -0,0 +1,46 @@
+"""
+NLTK resource setup for SpectraNLP.
+Checks for required NLTK data once per process and downloads anything missing.
+Run `python -m analysis._nltk_setup` to fetch every resource ahead of time.
+"""
+from functools import lru_cache
+import nltk
+from nltk.corpus import stopwords
+
+# NLTK data paths mapped to their downloader package names
+RESOURCES = {
+    'sentiment/vader_lexicon.zip': 'vader_lexicon',
+    'tokenizers/punkt': 'punkt',
+    'corpora/stopwords': 'stopwords',
+    'corpora/wordnet': 'wordnet',
+}
+
+# Paths already confirmed in this process
+_READY = set()
+
+def ensure(paths):
+    """
+    Make sure the given NLTK resources are available, downloading any that are missing.
+
+    Each path is looked up on disk at most once per process.
+
+    Args:
+        paths (iterable): NLTK data paths, as keys of RESOURCES.
+    """
+    for path in paths:
+        if path in _READY:
+            continue
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(RESOURCES[path])
+        _READY.add(path)
+
+@lru_cache(maxsize=None)
+def english_stopwords():
+    """Return the English stopword list as a frozenset, loaded once per process."""
+    ensure(['corpora/stopwords'])
+    return frozenset(stopwords.words('english'))
+
+if __name__ == "__main__":
+    ensure(RESOURCES)
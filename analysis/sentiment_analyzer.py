@@ -2,35 +2,161 @@
 Sentiment analysis functionality for SpectraNLP.
 Uses VADER sentiment analysis with customized lexicon for topic relevance.
 """
+import os
+import re
+import string
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property, lru_cache
+import numpy as np
 import pandas as pd
-import nltk
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import config
+from ._nltk_setup import ensure
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional
+    njit = None
+
+# Per-process analyzer used by analyze_dataframe worker pools
+_worker_analyzer = None
+
+# Labels indexed by sentiment code (0 negative, 1 neutral, 2 positive)
+_SENTIMENT_LABELS = np.array(['Negative', 'Neutral', 'Positive'])
+
+# Runs of more than four '!' or '?'; VADER's emphasis counts saturate at four
+_PUNCT_RUN_RE = re.compile(r"([!?])\1{4,}")
+
+# Minimum number of rows before the numba kernel is worth its dispatch cost
+_NUMBA_MIN_ROWS = 100_000
+
+def _label_codes_numpy(compound):
+    """Branch-free sentiment codes: bucket (-1, 0, 1) shifted to (0, 1, 2)."""
+    return (compound >= 0.05).astype(np.int8) - (compound <= -0.05).astype(np.int8) + 1
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _label_codes_numba(compound):
+        """Compute sentiment codes in a parallel JIT-compiled loop."""
+        codes = np.empty(compound.shape[0], dtype=np.int8)
+        for i in prange(compound.shape[0]):
+            if compound[i] >= 0.05:
+                codes[i] = 2
+            elif compound[i] <= -0.05:
+                codes[i] = 0
+            else:
+                codes[i] = 1
+        return codes
+else:
+    _label_codes_numba = None
+
+def _label_codes(compound):
+    """Map compound scores to sentiment codes, using numba for bulk inputs when available."""
+    if _label_codes_numba is not None and len(compound) >= _NUMBA_MIN_ROWS:
+        return _label_codes_numba(compound)
+    return _label_codes_numpy(compound)
+
+class _CompoundIntensityAnalyzer(SentimentIntensityAnalyzer):
+    """
+    VADER analyzer whose polarity_scores returns only the compound score,
+    skipping the pos/neg/neu split and the result dict.
+    """
+    def score_valence(self, sentiments, text):
+        if not sentiments:
+            return 0.0
+
+        sum_s = float(sum(sentiments))
+        # compute and add emphasis from punctuation in text
+        punct_emph_amplifier = self._punctuation_emphasis(sum_s, text)
+        if sum_s > 0:
+            sum_s += punct_emph_amplifier
+        elif sum_s < 0:
+            sum_s -= punct_emph_amplifier
+
+        return round(self.constants.normalize(sum_s), 4)
+
+@lru_cache(maxsize=None)
+def _shared_intensity_analyzer(lexicon_items):
+    """
+    Build one VADER analyzer per distinct custom lexicon and process.
+
+    Args:
+        lexicon_items (tuple): Sorted (word, score) pairs added to the VADER lexicon.
+
+    Returns:
+        tuple: (SentimentIntensityAnalyzer, compound-only analyzer sharing its lexicon,
+            frozenset of lexicon words)
+    """
+    sid = SentimentIntensityAnalyzer()
+    sid.lexicon.update(lexicon_items)
+
+    # Share the loaded lexicon and constants instead of parsing the file again
+    compound_sid = object.__new__(_CompoundIntensityAnalyzer)
+    compound_sid.__dict__.update(sid.__dict__)
+
+    return sid, compound_sid, frozenset(sid.lexicon)
+
+def _score_batch(texts, lexicon_update, max_text_length, compound_only=False):
+    """Score a batch of texts in a worker process, building the analyzer once."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = SentimentAnalyzer(lexicon_update, max_text_length)
+    if compound_only:
+        return [_worker_analyzer.compound_score(text) for text in texts]
+    return [_worker_analyzer.score_text(text) for text in texts]
 
 class SentimentAnalyzer:
     """
     Analyzes sentiment of text data using VADER sentiment analysis.
     """
-    def __init__(self, custom_lexicon=None):
+    def __init__(self, custom_lexicon=None, max_text_length=None):
         """
         Initialize the sentiment analyzer.
 
         Args:
             custom_lexicon (dict, optional): Custom lexicon to augment VADER.
                 Defaults to the lexicon in config.
+            max_text_length (int, optional): Texts are truncated to this many characters
+                before scoring; 0 disables truncation. Defaults to the value in config,
+                which scores full texts unless set.
         """
-        # Download VADER lexicon if not already present
-        try:
-            nltk.data.find('sentiment/vader_lexicon.zip')
-        except LookupError:
-            nltk.download('vader_lexicon')
+        custom_lex = custom_lexicon or config.VADER_CUSTOM_LEXICON
+        self.custom_lexicon = custom_lex
+        self.max_text_length = (config.VADER_MAX_TEXT_LENGTH if max_text_length is None
+                                else max_text_length)
 
-        self.sid = SentimentIntensityAnalyzer()
+        # Cache scores per distinct text; duplicate comments are common.
+        # VADER itself is only loaded on first use (see _vader).
+        self._polarity_cached = lru_cache(maxsize=1 << 16)(
+            lambda text: self.sid.polarity_scores(text)
+        )
+        self._compound_cached = lru_cache(maxsize=1 << 16)(
+            lambda text: self._compound_sid.polarity_scores(text)
+        )
 
-        # Update with custom lexicon
-        custom_lex = custom_lexicon or config.VADER_CUSTOM_LEXICON
-        if custom_lex:
-            self.sid.lexicon.update(custom_lex)
+    @cached_property
+    def _vader(self):
+        """
+        Load VADER on first use, downloading the lexicon if it is missing.
+
+        Analyzers with the same custom lexicon share one VADER instance and key set.
+        """
+        ensure(['sentiment/vader_lexicon.zip'])
+        custom_lex = self.custom_lexicon
+        return _shared_intensity_analyzer(tuple(sorted(custom_lex.items())) if custom_lex else ())
+
+    @property
+    def sid(self):
+        """nltk SentimentIntensityAnalyzer with the custom lexicon applied."""
+        return self._vader[0]
+
+    @property
+    def _compound_sid(self):
+        return self._vader[1]
+
+    @property
+    def _lexicon_keys(self):
+        return self._vader[2]
 
     def analyze_text(self, text):
         """
@@ -42,10 +168,7 @@ class SentimentAnalyzer:
         Returns:
             tuple: (sentiment_label, compound_score, scores_dict)
         """
-        if not text or pd.isna(text):
-            return 'Neutral', 0.0, {'compound': 0.0, 'neg': 0.0, 'neu': 1.0, 'pos': 0.0}
-
-        scores = self.sid.polarity_scores(str(text))
+        scores = self.score_text(text)
         compound = scores['compound']
 
         # Determine sentiment label based on compound score
@@ -58,6 +181,67 @@ class SentimentAnalyzer:
 
         return sentiment, compound, scores
 
+    def score_text(self, text):
+        """
+        Compute VADER polarity scores for a single text without labelling it.
+
+        Args:
+            text (str): Text to analyze.
+
+        Returns:
+            dict: Scores with 'neg', 'neu', 'pos' and 'compound' keys.
+        """
+        if pd.isna(text) or not text:
+            return {'compound': 0.0, 'neg': 0.0, 'neu': 1.0, 'pos': 0.0}
+
+        text = self._prepare_text(text)
+        if not self._has_lexicon_words(text):
+            # Match VADER: it drops one-character tokens and reports neu=0.0 if none are left
+            neu = 1.0 if any(len(token) > 1 for token in text.split()) else 0.0
+            return {'compound': 0.0, 'neg': 0.0, 'neu': neu, 'pos': 0.0}
+
+        # Copy so callers cannot mutate the cached result
+        return dict(self._polarity_cached(text))
+
+    def compound_score(self, text):
+        """
+        Compute only the VADER compound score for a single text.
+
+        Args:
+            text (str): Text to analyze.
+
+        Returns:
+            float: Compound score between -1 and 1.
+        """
+        if pd.isna(text) or not text:
+            return 0.0
+
+        text = self._prepare_text(text)
+        if not self._has_lexicon_words(text):
+            return 0.0
+
+        return self._compound_cached(text)
+
+    def _has_lexicon_words(self, text):
+        """
+        Check whether any token can match the VADER lexicon.
+
+        VADER only scores lexicon words, so texts without any (empty, URL-only,
+        numbers, ...) get zero compound, neg and pos scores and can skip the full
+        pipeline. Tokens
+        are checked as-is and with surrounding punctuation stripped, as VADER does.
+        """
+        keys = self._lexicon_keys
+        punctuation = string.punctuation
+        return any(token in keys or token.strip(punctuation) in keys for token in text.lower().split())
+
+    def _prepare_text(self, text):
+        """Bound VADER's work: collapse long '!'/'?' runs and truncate long texts."""
+        text = _PUNCT_RUN_RE.sub(r"\1\1\1\1", str(text))
+        if self.max_text_length:
+            text = text[:self.max_text_length]
+        return text
+
     def find_emotion_words(self, text):
         """
         Find words in the text that contribute to sentiment.
@@ -68,19 +252,38 @@ class SentimentAnalyzer:
         Returns:
             list: List of words that appear in the VADER lexicon.
         """
-        if not text or pd.isna(text):
+        if pd.isna(text) or not text:
             return []
 
         words = str(text).lower().split()
-        emotion_words = []
+        matches = self._lexicon_keys.intersection(words)
+        return [word for word in words if word in matches] if matches else []
 
-        for word in words:
-            if word.lower() in self.sid.lexicon:
-                emotion_words.append(word)
+    def find_emotion_words_batch(self, texts):
+        """
+        Find sentiment-bearing words for many texts at once.
 
-        return emotion_words
+        Args:
+            texts (iterable): Texts to analyze.
 
-    def analyze_dataframe(self, df, text_column='text'):
+        Returns:
+            list: One list of lexicon words per input text.
+        """
+        lexicon_keys = self._lexicon_keys
+        results = []
+
+        for text in texts:
+            if pd.isna(text) or not text:
+                results.append([])
+                continue
+            # Set intersection runs in C; only texts with matches need the ordered scan
+            words = str(text).lower().split()
+            matches = lexicon_keys.intersection(words)
+            results.append([word for word in words if word in matches] if matches else [])
+
+        return results
+
+    def analyze_dataframe(self, df, text_column='text', n_jobs=None, batch_size=500, compound_only=False):
         """
         Analyze sentiment for all texts in a DataFrame.
 
@@ -88,6 +291,11 @@ class SentimentAnalyzer:
             df (pandas.DataFrame): DataFrame containing text data.
             text_column (str, optional): Name of the column containing text.
                 Defaults to 'text'.
+            n_jobs (int, optional): Number of worker processes. Defaults to the CPU count.
+            batch_size (int, optional): Number of texts sent to a worker per task.
+                Inputs no larger than one batch are scored in-process. Defaults to 500.
+            compound_only (bool, optional): Compute only the compound score and skip the
+                pos/neu/neg score columns. Defaults to False.
 
         Returns:
             pandas.DataFrame: Original DataFrame with added sentiment columns.
@@ -96,27 +304,58 @@ class SentimentAnalyzer:
             print(f"Column '{text_column}' not found in DataFrame or DataFrame is empty.")
             return df
 
-        # Create a copy to avoid modifying the original
-        result_df = df.copy()
-
-        # Apply sentiment analysis to each row
-        result_df['sentiment'] = ''
-        result_df['sentiment_score'] = 0.0
-        result_df['pos_score'] = 0.0
-        result_df['neu_score'] = 0.0
-        result_df['neg_score'] = 0.0
-        result_df['emotion_words'] = None
-
-        for idx, row in result_df.iterrows():
-            text = row[text_column]
-            sentiment, compound, scores = self.analyze_text(text)
-            emotion_words = self.find_emotion_words(text)
-
-            result_df.at[idx, 'sentiment'] = sentiment
-            result_df.at[idx, 'sentiment_score'] = compound
-            result_df.at[idx, 'pos_score'] = scores['pos']
-            result_df.at[idx, 'neu_score'] = scores['neu']
-            result_df.at[idx, 'neg_score'] = scores['neg']
-            result_df.at[idx, 'emotion_words'] = ','.join(emotion_words) if emotion_words else ''
-
-        return result_df
\ No newline at end of file
+        # Shallow copy: new columns are added without duplicating existing data
+        result_df = df.copy(deep=False)
+
+        # Score every text in one pass instead of iterating rows
+        texts = result_df[text_column].tolist()
+        n_jobs = n_jobs or os.cpu_count() or 1
+        score = self.compound_score if compound_only else self.score_text
+
+        # Score each distinct text once; repeated comments are common and would
+        # otherwise miss the per-process caches of other workers
+        unique_texts = list(dict.fromkeys(texts))
+
+        if n_jobs == 1 or len(unique_texts) <= batch_size:
+            unique_scores = [score(text) for text in unique_texts]
+        else:
+            batches = [unique_texts[i:i + batch_size] for i in range(0, len(unique_texts), batch_size)]
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(batches))) as executor:
+                futures = [executor.submit(_score_batch, batch, self.custom_lexicon,
+                                           self.max_text_length, compound_only)
+                           for batch in batches]
+                unique_scores = [scores for future in futures for scores in future.result()]
+
+        if len(unique_texts) == len(texts):
+            scored = unique_scores
+        else:
+            scores_by_text = dict(zip(unique_texts, unique_scores))
+            scored = [scores_by_text[text] for text in texts]
+
+        if compound_only:
+            compound = np.fromiter(scored, dtype=np.float64, count=len(scored))
+            component_columns = {}
+        else:
+            scores_df = pd.DataFrame.from_records(
+                scored, columns=['compound', 'neg', 'neu', 'pos'], index=result_df.index
+            )
+            compound = scores_df['compound'].to_numpy()
+            component_columns = {
+                'pos_score': scores_df['pos'].to_numpy(),
+                'neu_score': scores_df['neu'].to_numpy(),
+                'neg_score': scores_df['neg'].to_numpy(),
+            }
+
+        labels = pd.Categorical.from_codes(_label_codes(compound), categories=_SENTIMENT_LABELS)
+
+        emotion_words = self.find_emotion_words_batch(texts)
+
+        sentiment_columns = pd.DataFrame({
+            'sentiment': labels,
+            'sentiment_score': compound,
+            **component_columns,
+            'emotion_words': emotion_words,
+        }, index=result_df.index)
+
+        result_df = result_df.drop(columns=sentiment_columns.columns, errors='ignore')
+        return pd.concat([result_df, sentiment_columns], axis=1)
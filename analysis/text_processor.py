@@ -1,35 +1,64 @@
 """
 Text preprocessing utilities for SpectraNLP.
 """
+import os
 import re
 import unicodedata
+from functools import lru_cache
+from multiprocessing import Pool
 import nltk
 import contractions
 import inflect
-from nltk.corpus import stopwords
+import pandas as pd
 from nltk.stem import WordNetLemmatizer
+from ._nltk_setup import ensure, english_stopwords
+
+# Per-process TextProcessor used by preprocess_dataframe worker pools
+_worker_processor = None
+
+def _init_worker(fast_tokenize):
+  """Build one TextProcessor per worker process."""
+  global _worker_processor
+  _worker_processor = TextProcessor(fast_tokenize=fast_tokenize)
+
+def _worker_preprocess_chunk(texts):
+  """Preprocess a chunk of texts in a worker process."""
+  return [_worker_processor.preprocess_text(text) for text in texts]
 
 class TextProcessor:
   """
   Process and clean text data for analysis.
   """
-  def __init__(self):
+  def __init__(self, fast_tokenize=True):
       """
       Initialize the text processor.
+
+      Args:
+          fast_tokenize (bool, optional): Tokenize with a compiled word regex instead of
+              nltk.word_tokenize. Defaults to True.
       """
-      # Download required NLTK data
-      try:
-          nltk.data.find('tokenizers/punkt')
-          nltk.data.find('corpora/stopwords')
-          nltk.data.find('corpora/wordnet')
-      except LookupError:
-          nltk.download('punkt')
-          nltk.download('stopwords')
-          nltk.download('wordnet')
+      # Make sure required NLTK data is available (checked once per process)
+      required = ['corpora/stopwords', 'corpora/wordnet']
+      if not fast_tokenize:
+          required.append('tokenizers/punkt')
+      ensure(required)
 
       self.lemmatizer = WordNetLemmatizer()
       self.p_engine = inflect.engine()
 
+      # Load stopwords and compile patterns once rather than per call
+      self._stopwords = english_stopwords()
+      self._url_re = re.compile(r"http\S+|www\S+|https\S+")
+      self._punct_re = re.compile(r'[^\w\s]')
+      self._tok_re = re.compile(r"\w+")
+      self.fast_tokenize = fast_tokenize
+
+      # Per-instance caches for repeated tokens and documents
+      self._lemmatize_v = lru_cache(maxsize=200_000)(
+          lambda word: self.lemmatizer.lemmatize(word, pos='v')
+      )
+      self._preprocess_cached = lru_cache(maxsize=50_000)(self._preprocess_text)
+
   def preprocess_text(self, text, lemmatize=True, remove_stopwords=True):
       """
       Preprocess text by applying multiple cleaning steps.
@@ -42,47 +71,74 @@ class TextProcessor:
       Returns:
           str: Preprocessed text.
       """
-      if not text:
+      if pd.isna(text) or not text:
           return ""
 
-      # Convert to string if not already
-      text = str(text)
+      return self._preprocess_cached(str(text), lemmatize, remove_stopwords)
 
+  def _preprocess_text(self, text, lemmatize, remove_stopwords):
+      """Run the preprocessing pipeline on a string (uncached)."""
       # Remove URLs
       text = self.remove_urls(text)
 
       # Replace contractions (e.g., "don't" -> "do not")
       text = self.replace_contractions(text)
 
-      # Tokenize
-      tokens = nltk.word_tokenize(text)
+      if self.fast_tokenize:
+          # Word-character tokens are already free of punctuation
+          tokens = self._tok_re.findall(text)
+      else:
+          tokens = nltk.word_tokenize(text)
+
+      # Clean every token in a single pass and join back into text
+      return " ".join(self._clean_tokens(
+          tokens,
+          strip_punctuation=not self.fast_tokenize,
+          lemmatize=lemmatize,
+          remove_stopwords=remove_stopwords
+      ))
+
+  def _clean_tokens(self, tokens, strip_punctuation=True, lemmatize=True, remove_stopwords=True):
+      """
+      Apply the per-token cleaning steps in one pass.
 
-      # Remove non-ASCII characters
-      tokens = self.remove_non_ascii(tokens)
+      Each token is ASCII-folded, lowercased, stripped of punctuation, has digits
+      spelled out, and is then filtered against stopwords and lemmatized.
 
-      # Convert to lowercase
-      tokens = self.to_lowercase(tokens)
+      Args:
+          tokens (iterable): Raw tokens.
+          strip_punctuation (bool, optional): Whether to strip punctuation. Defaults to True.
+          lemmatize (bool, optional): Whether to apply lemmatization. Defaults to True.
+          remove_stopwords (bool, optional): Whether to remove stopwords. Defaults to True.
 
-      # Remove punctuation
-      tokens = self.remove_punctuation(tokens)
+      Yields:
+          str: Cleaned tokens that survive filtering.
+      """
+      punct_sub = self._punct_re.sub
+      stop = self._stopwords
+      lemmatize_v = self._lemmatize_v
 
-      # Replace numbers with text representation
-      tokens = self.replace_numbers(tokens)
+      for word in tokens:
+          word = unicodedata.normalize('NFKD', word).encode('ascii', 'ignore').decode('utf-8', 'ignore').lower()
+          if strip_punctuation:
+              word = punct_sub('', word)
+          if not word:
+              continue
 
-      # Remove stopwords if requested
-      if remove_stopwords:
-          tokens = self.remove_stopwords(tokens)
+          if word.isdigit():
+              try:
+                  word = self.p_engine.number_to_words(word)
+              except:
+                  pass
 
-      # Apply lemmatization if requested
-      if lemmatize:
-          tokens = self.lemmatize_words(tokens)
+          if remove_stopwords and word in stop:
+              continue
 
-      # Join tokens back into text
-      return " ".join(tokens)
+          yield lemmatize_v(word) if lemmatize else word
 
   def remove_urls(self, text):
       """Remove URLs from text."""
-      return re.sub(r"http\S+|www\S+|https\S+", "", text)
+      return self._url_re.sub("", text)
 
   def replace_contractions(self, text):
       """Replace contractions in text."""
@@ -98,7 +154,8 @@ class TextProcessor:
 
   def remove_punctuation(self, tokens):
       """Remove punctuation from tokens."""
-      return [re.sub(r'[^\w\s]', '', word) for word in tokens if re.sub(r'[^\w\s]', '', word)]
+      stripped = (self._punct_re.sub('', word) for word in tokens)
+      return [word for word in stripped if word]
 
   def replace_numbers(self, tokens):
       """Replace numbers with text representation."""
@@ -115,13 +172,13 @@ class TextProcessor:
 
   def remove_stopwords(self, tokens):
       """Remove stopwords from tokens."""
-      return [word for word in tokens if word not in stopwords.words('english')]
+      return [word for word in tokens if word not in self._stopwords]
 
   def lemmatize_words(self, tokens):
       """Lemmatize tokens."""
-      return [self.lemmatizer.lemmatize(word, pos='v') for word in tokens]
+      return [self._lemmatize_v(word) for word in tokens]
 
-  def preprocess_dataframe(self, df, text_column='text', new_column=None):
+  def preprocess_dataframe(self, df, text_column='text', new_column=None, n_jobs=None, chunksize=500):
       """
       Preprocess text in a DataFrame.
 
@@ -131,6 +188,9 @@ class TextProcessor:
               Defaults to 'text'.
           new_column (str, optional): Name of the new column to store preprocessed text.
               If None, overwrites the original column. Defaults to None.
+          n_jobs (int, optional): Number of worker processes. Defaults to the CPU count.
+          chunksize (int, optional): Number of texts sent to a worker per task.
+              Inputs no larger than one chunk are processed in-process. Defaults to 500.
 
       Returns:
           pandas.DataFrame: DataFrame with preprocessed text.
@@ -139,13 +199,25 @@ class TextProcessor:
           print(f"Column '{text_column}' not found in DataFrame or DataFrame is empty.")
           return df
 
-      # Create a copy to avoid modifying the original
-      result_df = df.copy()
+      # Shallow copy: new columns are added without duplicating existing data
+      result_df = df.copy(deep=False)
 
       # Determine output column
       output_column = new_column or text_column
 
-      # Apply preprocessing to each row
-      result_df[output_column] = result_df[text_column].apply(self.preprocess_text)
+      texts = result_df[text_column].tolist()
+      n_jobs = n_jobs or os.cpu_count() or 1
+
+      if n_jobs == 1 or len(texts) <= chunksize:
+          processed = [self.preprocess_text(text) for text in texts]
+      else:
+          # Fan chunks out to long-lived workers, each holding its own processor
+          chunks = [texts[i:i + chunksize] for i in range(0, len(texts), chunksize)]
+          with Pool(min(n_jobs, len(chunks)), initializer=_init_worker,
+                    initargs=(self.fast_tokenize,)) as pool:
+              processed = [text for chunk in pool.imap(_worker_preprocess_chunk, chunks, chunksize=1)
+                           for text in chunk]
+
+      result_df[output_column] = pd.array(processed, dtype='string[pyarrow]')
 
       return result_df
\ No newline at end of file
@@ -2,13 +2,17 @@
 SpectraNLP - A comprehensive sentiment analysis platform.
 This is the main application file for the Streamlit interface.
 """
+import io
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from datetime import datetime, timedelta
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend; figures are only rendered to images
 import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 from wordcloud import WordCloud
-import nltk
 import re
 import os
 import time
@@ -24,16 +28,6 @@ from visualization.trend_plots import TrendPlots
 from utils.helpers import standardize_dataframe, merge_dataframes
 import config
 
-# Ensure required NLTK data is downloaded
-try:
-    nltk.data.find('sentiment/vader_lexicon.zip')
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('vader_lexicon')
-    nltk.download('punkt')
-    nltk.download('stopwords')
-
 # Set page configuration
 st.set_page_config(
     page_title="SpectraNLP - Sentiment Analysis",
@@ -42,11 +36,35 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_data(persist='disk')
+def load_reddit_csv(csv_file, modified_time):
+    """
+    Read and parse the Reddit CSV once, persisting the result on disk.
+    The file's modification time is part of the cache key so edits are picked up.
+    """
+    # Only load the columns we use, parsing timestamps while reading
+    header = pd.read_csv(csv_file, nrows=0).columns
+    columns = [col for col in ('text', 'created_time', 'author') if col in header]
+    table = pa_csv.read_csv(
+        csv_file,
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            column_types={'text': pa.string()} if 'text' in columns else None,
+            timestamp_parsers=[pa_csv.ISO8601, '%Y-%m-%d %H:%M:%S']
+        )
+    )
+
+    # Keep strings Arrow-backed; timestamps convert to regular datetime64 columns
+    return table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+
 # Cache frequently used data
-@st.cache_data(ttl=10)  # Cache for 1 hour
+@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour; progress is shown by the caller
 def load_cached_data(source, keywords, start_date, end_date, max_results=100):
     """
     Load data with caching to prevent repeated API calls.
+    Flickr searches and comment downloads are cached here as a whole, so rerunning
+    with the same inputs makes no API calls.
     """
     if source == "Flickr":
         collector = FlickrCollector()
@@ -67,17 +85,18 @@ def load_cached_data(source, keywords, start_date, end_date, max_results=100):
         try:
             csv_file = "reddit_comments.csv"  # Default file name
             if os.path.exists(csv_file):
-                data = pd.read_csv(csv_file)
+                data = load_reddit_csv(csv_file, os.path.getmtime(csv_file))
 
                 # Filter by date and keywords
                 if 'created_time' in data.columns:
-                    data['created_time'] = pd.to_datetime(data['created_time'])
+                    if not pd.api.types.is_datetime64_any_dtype(data['created_time']):
+                        data['created_time'] = pd.to_datetime(data['created_time'])
                     data = data[(data['created_time'] >= start_date) & (data['created_time'] <= end_date)]
 
                 if keywords and 'text' in data.columns:
                     # Filter for rows containing any of the keywords
-                    keyword_pattern = '|'.join(keywords)
-                    data = data[data['text'].str.contains(keyword_pattern, case=False, na=False)]
+                    keyword_pattern = re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+                    data = data[data['text'].str.contains(keyword_pattern, na=False)]
 
                 return standardize_dataframe(data, source, text_col='text', date_col='created_time')
             else:
@@ -99,6 +118,36 @@ def get_text_processor():
     """Get a cached text processor instance."""
     return TextProcessor()
 
+@st.cache_data
+def get_extreme_positions(scores, sample_type, num_samples):
+    """
+    Get row positions of the most positive or most negative scores, cached across reruns.
+    Uses a partial selection (O(N log k)) instead of sorting the whole column.
+    """
+    scores = scores.reset_index(drop=True)
+    if sample_type == "Most Positive":
+        return scores.nlargest(num_samples).index.to_numpy()
+    return scores.nsmallest(num_samples).index.to_numpy()
+
+# Trend figures are cached per input; st.cache_data hands every rerun its own copy.
+# Only the columns each plot reads are passed in, so only those are hashed.
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def get_sentiment_intensity_fig(data, interval):
+    """Get a cached sentiment intensity figure for the date and score columns."""
+    return TrendPlots.plot_sentiment_intensity(
+        data, date_col='date', score_col='sentiment_score', interval=interval
+    )
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def get_source_comparison_fig(sentiments_by_source):
+    """Get a cached source comparison figure for each source's sentiment column."""
+    return TrendPlots.plot_source_comparison(sentiments_by_source)
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def get_keyword_comparison_fig(data, keywords, text_col):
+    """Get a cached keyword comparison heatmap for the text and sentiment columns."""
+    return TrendPlots.plot_keyword_comparison(data, keywords, text_col=text_col)
+
 # App title
 st.title("SpectraNLP - Sentiment Analysis Platform")
 st.markdown("""
@@ -324,11 +373,9 @@ if run_analysis:
         # Sentiment intensity
         st.subheader("Sentiment Intensity Over Time")
         try:
-            sentiment_intensity_fig = TrendPlots.plot_sentiment_intensity(
-                sentiment_data,
-                date_col='date',
-                score_col='sentiment_score',
-                interval=time_interval
+            sentiment_intensity_fig = get_sentiment_intensity_fig(
+                sentiment_data[['date', 'sentiment_score']],
+                time_interval
             )
             st.plotly_chart(sentiment_intensity_fig, use_container_width=True)
         except Exception as e:
@@ -338,7 +385,9 @@ if run_analysis:
         if len(sources_data) > 1:
             st.subheader("Sentiment Comparison Across Sources")
             try:
-                source_comparison_fig = TrendPlots.plot_source_comparison(sources_data)
+                source_comparison_fig = get_source_comparison_fig({
+                    name: df[['sentiment']] for name, df in sources_data.items() if 'sentiment' in df.columns
+                })
                 st.plotly_chart(source_comparison_fig, use_container_width=True)
             except Exception as e:
                 st.error(f"Error plotting source comparison: {e}")
@@ -347,12 +396,13 @@ if run_analysis:
         if len(keywords) > 1:
             st.subheader("Keyword Sentiment Comparison")
             try:
-                keyword_comparison_fig = TrendPlots.plot_keyword_comparison(
-                    sentiment_data,
+                keyword_comparison_fig = get_keyword_comparison_fig(
+                    sentiment_data[[text_col, 'sentiment']],
                     keywords,
-                    text_col=text_col
+                    text_col
                 )
                 st.pyplot(keyword_comparison_fig)
+                plt.close(keyword_comparison_fig)  # Free the figure; Streamlit has already rendered it
             except Exception as e:
                 st.error(f"Error plotting keyword comparison: {e}")
 
@@ -370,6 +420,7 @@ if run_analysis:
                         sentiment_filter='Positive'
                     )
                     st.pyplot(positive_cloud)
+                    plt.close(positive_cloud)
 
                 with col2:
                     st.write("Neutral Sentiment")
@@ -379,6 +430,7 @@ if run_analysis:
                         sentiment_filter='Neutral'
                     )
                     st.pyplot(neutral_cloud)
+                    plt.close(neutral_cloud)
 
                 with col3:
                     st.write("Negative Sentiment")
@@ -388,6 +440,7 @@ if run_analysis:
                         sentiment_filter='Negative'
                     )
                     st.pyplot(negative_cloud)
+                    plt.close(negative_cloud)
             except Exception as e:
                 st.error(f"Error generating word clouds: {e}")
 
@@ -404,56 +457,64 @@ if run_analysis:
 
         if sample_type == "Random":
             samples = sentiment_data.sample(num_samples)
-        elif sample_type == "Most Positive":
-            samples = sentiment_data.sort_values('sentiment_score', ascending=False).head(num_samples)
-        else:  # Most Negative
-            samples = sentiment_data.sort_values('sentiment_score', ascending=True).head(num_samples)
-
-        for i, (_, row) in enumerate(samples.iterrows()):
-            sentiment_color = {
-                'Positive': '#4CAF50',  # Green
-                'Neutral': '#FFC107',   # Amber
-                'Negative': '#F44336'   # Red
-            }.get(row['sentiment'], '#757575')  # Gray default
+        else:
+            samples = sentiment_data.iloc[
+                get_extreme_positions(sentiment_data['sentiment_score'], sample_type, num_samples)
+            ]
+
+        # Prebuild per-sample colors and score markup for all samples at once
+        sentiment_colors = {
+            'Positive': '#4CAF50',  # Green
+            'Neutral': '#FFC107',   # Amber
+            'Negative': '#F44336'   # Red
+        }
+        colors = samples['sentiment'].astype(object).map(sentiment_colors).fillna('#757575')  # Gray default
+        score_markup = (
+            '<div style="text-align: center;"><span style="color: ' + colors
+            + '; font-weight: bold;">Sentiment Score: '
+            + samples['sentiment_score'].map('{:.2f}'.format) + '</span></div>'
+        )
+        if 'emotion_words' in samples.columns:
+            sample_emotion_words = samples['emotion_words']
+        else:
+            sample_emotion_words = pd.Series([[]] * len(samples), index=samples.index)
 
-            with st.expander(f"Sample {i+1} - {row['source']} ({row['sentiment']})"):
-                st.markdown(f"**Date:** {row['date']}")
+        sample_rows = zip(
+            samples['source'], samples['sentiment'], samples['date'], samples['text'],
+            sample_emotion_words, colors, score_markup
+        )
+        for i, (source, sentiment, date, text, emotion_words, sentiment_color, score_html) in enumerate(sample_rows):
+            with st.expander(f"Sample {i+1} - {source} ({sentiment})"):
+                st.markdown(f"**Date:** {date}")
 
                 # Prepare text with highlighted emotion words
-                if 'emotion_words' in row and row['emotion_words']:
-                    emotion_words = row['emotion_words'].split(',')
-                    text = row['text']
-
-                    # Highlight emotion words
-                    for word in sorted(emotion_words, key=len, reverse=True):
-                        if word in text:
-                            text = text.replace(
-                                word,
-                                f'<span style="background-color: {sentiment_color}; color: white; padding: 1px 3px; border-radius: 2px;">{word}</span>'
-                            )
-
-                    st.markdown(text, unsafe_allow_html=True)
-                else:
-                    st.write(row['text'])
+                if emotion_words:
+                    # Highlight all emotion words in a single pass
+                    text = SentimentPlots.emotion_words_pattern(emotion_words).sub(
+                        lambda m: f'<span style="background-color: {sentiment_color}; color: white; padding: 1px 3px; border-radius: 2px;">{m.group(0)}</span>',
+                        text
+                    )
 
-                # Display sentiment score with gauge
-                st.markdown(f"""
-                    <div style="text-align: center;">
-                        <span style="color: {sentiment_color}; font-weight: bold;">
-                            Sentiment Score: {row['sentiment_score']:.2f}
-                        </span>
-                    </div>
-                """, unsafe_allow_html=True)
+                    # Display text and sentiment score together
+                    st.markdown(f"{text}\n\n{score_html}", unsafe_allow_html=True)
+                else:
+                    st.write(text)
+                    st.markdown(score_html, unsafe_allow_html=True)
 
         # Data explorer
         with st.expander("Data Explorer"):
             st.dataframe(sentiment_data)
 
-            # Allow downloading data
-            csv = sentiment_data.to_csv(index=False)
+            # Allow downloading data, serialized by Arrow's C++ CSV writer
+            csv_buffer = io.BytesIO()
+            export_data = sentiment_data
+            if 'emotion_words' in export_data.columns:
+                # CSV has no list type, so flatten emotion words for export
+                export_data = export_data.assign(emotion_words=export_data['emotion_words'].str.join(','))
+            pa_csv.write_csv(pa.Table.from_pandas(export_data, preserve_index=False), csv_buffer)
             st.download_button(
                 label="Download Data as CSV",
-                data=csv,
+                data=csv_buffer.getvalue(),
                 file_name="spectranlp_sentiment_data.csv",
                 mime="text/csv"
             )
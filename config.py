@@ -27,6 +27,14 @@ DEFAULT_SEARCH_TERMS = [
     'israel palestine conflict'
 ]
 
+# Flickr API response cache (SQLite files in the working directory)
+FLICKR_CACHE_NAME = os.getenv('FLICKR_CACHE_NAME', 'flickr_cache')
+FLICKR_CACHE_EXPIRE = 24 * 60 * 60  # seconds
+
+# NYT API response cache (SQLite file in the working directory)
+NYT_CACHE_NAME = os.getenv('NYT_CACHE_NAME', 'nyt_cache')
+NYT_CACHE_EXPIRE = 24 * 60 * 60  # seconds
+
 # Date range settings
 DEFAULT_START_DATE = "2023-01-01"
 DEFAULT_END_DATE = "2024-11-01"
@@ -89,4 +97,7 @@ VADER_CUSTOM_LEXICON = {
     'safe': 0.6,
     'rebuild': 0.5,
     'rebuilding': 0.5,
-}
\ No newline at end of file
+}
+# Longest text (in characters) passed to VADER; None scores full texts.
+# Truncation changes the scores of longer texts, so it is off by default.
+VADER_MAX_TEXT_LENGTH = None
@@ -1,30 +1,143 @@
 """
 Flickr API client for fetching photos and comments for sentiment analysis.
 """
+import asyncio
 import html
+import math
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+import aiohttp
 import pandas as pd
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+from dateutil.tz import tzlocal
 from flickrapi import FlickrAPI
 import config
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional
+    from json import loads as _json_loads
+
+FLICKR_REST_URL = "https://api.flickr.com/services/rest/"
+
+# Largest page size accepted by flickr.photos.search
+FLICKR_MAX_PER_PAGE = 500
+
+# URLs and HTML tags are removed in one regex pass
+_STRIP_RE = re.compile(r"https?://\S+|<[^>]+>")
+
+def _is_ok_payload(body):
+    """True if body is a Flickr JSON payload with stat 'ok'; error replies are not cached."""
+    try:
+        return _json_loads(body).get("stat") == "ok"
+    except (ValueError, AttributeError):
+        return False
+
+async def _is_ok_aiohttp_response(response):
+    """aiohttp-client-cache filter: cache a comment response only if Flickr reported success."""
+    return _is_ok_payload(await response.read())
+
+@lru_cache(maxsize=1 << 16)
+def _clean_comment_text(text):
+    """Cached implementation of FlickrCollector.clean_comment_text; repeated comments are common."""
+    text = html.unescape(text)
+    text = _STRIP_RE.sub("", text)  # Remove URLs and HTML tags
+    text = text.encode("ascii", "ignore").decode("ascii")  # Remove non-ASCII characters
+    text = " ".join(text.split())  # Normalize whitespace
+    return text if len(text) > 3 else None
+
+class _TokenBucket:
+    """
+    Asynchronous token-bucket rate limiter.
+    Allows bursts of up to max_rate requests while capping the average rate
+    at max_rate per time_period seconds.
+    """
+    def __init__(self, max_rate, time_period):
+        self.capacity = max_rate
+        self.rate = max_rate / time_period
+        self.tokens = max_rate
+        self.updated = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available, then consume it."""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self.updated is not None:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
 class FlickrCollector:
     """
     A client for collecting data from Flickr API.
     """
-    def __init__(self, api_key=None, api_secret=None):
+    def __init__(self, api_key=None, api_secret=None, max_concurrency=8,
+                 cache_name=None, cache_expire=None):
         """
         Initialize the Flickr API client.
 
         Args:
             api_key (str, optional): Flickr API key. Defaults to value from config.
             api_secret (str, optional): Flickr API secret. Defaults to value from config.
+            max_concurrency (int, optional): Maximum number of concurrent search and
+                comment requests. Defaults to 8.
+            cache_name (str, optional): Base name of the SQLite response caches.
+                Defaults to value from config.
+            cache_expire (int, optional): Seconds before cached responses expire.
+                Defaults to value from config.
         """
         self.api_key = api_key or config.FLICKR_API_KEY
         self.api_secret = api_secret or config.FLICKR_API_SECRET
+        self.max_concurrency = max_concurrency
+        self.cache_name = cache_name or config.FLICKR_CACHE_NAME
+        self.cache_expire = cache_expire or config.FLICKR_CACHE_EXPIRE
         self.flickr = FlickrAPI(self.api_key, self.api_secret, format="parsed-json")
 
+        # flickrapi sends every call through this session; cache responses on disk
+        self.flickr.flickr_oauth.session = requests_cache.CachedSession(
+            self.cache_name,
+            backend='sqlite',
+            expire_after=self.cache_expire,
+            allowable_methods=('GET', 'POST'),
+            cache_control=True,
+            # Flickr reports errors and rate limits as HTTP 200 with stat 'fail'
+            filter_fn=lambda response: _is_ok_payload(response.content)
+        )
+
+        # Query parameters shared by every comment request
+        self._comment_params = {
+            "method": "flickr.photos.comments.getList",
+            "api_key": self.api_key,
+            "format": "json",
+            "nojsoncallback": 1,
+        }
+
+        # Keep-alive pool sized for the concurrent searches, retrying transient failures.
+        # flickrapi POSTs even read-only calls, so retries are allowed for every method.
+        # Only server errors are retried, with backoff capped at 5 seconds and Retry-After
+        # ignored, so a rate-limited reply cannot stall a search thread.
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.max_concurrency,
+            max_retries=Retry(total=3, backoff_factor=0.3, backoff_max=5,
+                              status_forcelist=[500, 502, 503, 504], allowed_methods=None,
+                              respect_retry_after_header=False)
+        )
+        self.flickr.flickr_oauth.session.mount('https://', adapter)
+
     def clean_comment_text(self, text):
         """
         Clean and normalize comment text.
@@ -35,12 +148,7 @@ class FlickrCollector:
         Returns:
             str or None: Cleaned text, or None if text is too short after cleaning.
         """
-        text = html.unescape(text)
-        text = re.sub(r"https?://\S+", "", text)  # Remove URLs
-        text = re.sub(r"<[^>]+>", "", text)  # Remove HTML tags
-        text = re.sub(r"[^\x00-\x7F]+", "", text)  # Remove non-ASCII characters
-        text = " ".join(text.split()).strip()  # Normalize whitespace
-        return text if len(text) > 3 else None
+        return _clean_comment_text(str(text))
 
     def search_for_photos(self, keyword, start_date, end_date, num_images=100):
         """
@@ -55,20 +163,55 @@ class FlickrCollector:
         Returns:
             list: List of photo IDs matching the search criteria.
         """
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return self._search_keywords([keyword], start_date, end_date, num_images, executor)[0]
+
+    def _search_keywords(self, keywords, start_date, end_date, num_images, executor):
+        """
+        Search several keywords, running every (keyword, page) request on one executor.
+
+        The first page of each keyword tells us how many pages exist; the remaining
+        pages of all keywords are then fetched together, so at most max_concurrency
+        search requests are in flight.
+
+        Returns:
+            list: One list of photo IDs per keyword, in keyword order.
+        """
         start = int(datetime.strptime(start_date, '%Y-%m-%d').timestamp())
         end = int(datetime.strptime(end_date, '%Y-%m-%d').timestamp())
 
-        photos = self.flickr.photos.search(
-            tags=keyword,
-            tag_mode="all",
-            min_upload_date=start,
-            max_upload_date=end,
-            per_page=num_images,
-            sort="date-posted-desc",
-            extras="date_upload"
-        )
-
-        return [photo['id'] for photo in photos['photos']['photo']]
+        per_page = min(num_images, FLICKR_MAX_PER_PAGE)
+
+        def search_page(task):
+            index, page = task
+            return self.flickr.photos.search(
+                tags=keywords[index],
+                tag_mode="all",
+                min_upload_date=start,
+                max_upload_date=end,
+                per_page=per_page,
+                page=page,
+                sort="date-posted-desc"
+            )['photos']
+
+        pages_by_keyword = [
+            [first_page] for first_page in executor.map(search_page, [(index, 1) for index in range(len(keywords))])
+        ]
+
+        rest_tasks = [
+            (index, page)
+            for index, (first_page,) in enumerate(pages_by_keyword)
+            for page in range(2, min(int(first_page.get('pages', 1)), math.ceil(num_images / per_page)) + 1)
+        ]
+        for (index, _), page in zip(rest_tasks, executor.map(search_page, rest_tasks)):
+            pages_by_keyword[index].append(page)
+
+        results = []
+        for pages in pages_by_keyword:
+            photo_ids = [photo['id'] for page in pages for photo in page['photo']]
+            results.append(photo_ids[:num_images])
+
+        return results
 
     def fetch_comments(self, photo_ids):
         """
@@ -80,32 +223,103 @@ class FlickrCollector:
         Returns:
             tuple: (DataFrame of comments, dict of comment counts per photo)
         """
-        comment_data = []
+        return asyncio.run(self.fetch_comments_async(photo_ids))
+
+    async def fetch_comments_async(self, photo_ids):
+        """
+        Fetch comments for a list of photo IDs concurrently.
+
+        Requests are bounded by max_concurrency and by a token bucket that keeps
+        the average rate within Flickr's limit of 3600 calls per hour.
+
+        Args:
+            photo_ids (list): List of Flickr photo IDs.
+
+        Returns:
+            tuple: (DataFrame of comments, dict of comment counts per photo)
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        limiter = _TokenBucket(3600, 3600)
+
+        cache = SQLiteBackend(
+            cache_name=f"{self.cache_name}_comments",
+            expire_after=self.cache_expire,
+            cache_control=True,
+            filter_fn=_is_ok_aiohttp_response
+        )
+
+        # One keep-alive connection per concurrent request, reused across photos
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+
+        async with CachedSession(cache=cache, connector=connector,
+                                 timeout=aiohttp.ClientTimeout(total=30)) as session:
+            responses = await asyncio.gather(*[
+                self._fetch_photo_comments(session, semaphore, limiter, photo_id)
+                for photo_id in photo_ids
+            ])
+
+        # Accumulate one list per column rather than one dict per comment
+        photo_id_col, author_col, date_ts_col, text_col = [], [], [], []
         photo_comment_counts = {}
 
-        for photo_id in photo_ids:
+        for photo_id, comments in responses:
+            if comments is None:
+                continue
+            photo_comment_counts[photo_id] = len(comments)
+
+            for comment in comments:
+                comment_text = self.clean_comment_text(comment.get("_content", ""))
+                if comment_text:
+                    photo_id_col.append(photo_id)
+                    author_col.append(comment.get("authorname", ""))
+                    date_ts_col.append(int(comment.get("datecreate", 0)))
+                    text_col.append(comment_text)
+
+        # Convert all Unix timestamps at once, truncated to the local calendar day
+        # like datetime.fromtimestamp; the result is naive local time
+        dates = (
+            pd.to_datetime(pd.Series(date_ts_col, dtype="int64"), unit="s", utc=True)
+            .dt.tz_convert(tzlocal()).dt.tz_localize(None).dt.normalize()
+        )
+        comments_df = pd.DataFrame({
+            "photo_id": photo_id_col,
+            "author": author_col,
+            "date": dates,
+            "comment_text": text_col,
+        })
+
+        return comments_df, photo_comment_counts
+
+    async def _fetch_photo_comments(self, session, semaphore, limiter, photo_id):
+        """
+        Fetch the raw comment list for one photo.
+
+        Returns:
+            tuple: (photo_id, list of comment dicts, or None if the request failed)
+        """
+        params = {**self._comment_params, "photo_id": photo_id}
+
+        async with semaphore:
+            await limiter.acquire()
             try:
-                response = self.flickr.photos.comments.getList(photo_id=photo_id)
-                comments = response.get("comments", {}).get("comment", [])
-                photo_comment_counts[photo_id] = len(comments)
-
-                for comment in comments:
-                    comment_text = self.clean_comment_text(comment.get("_content", ""))
-                    if comment_text:
-                        comment_data.append({
-                            "photo_id": photo_id,
-                            "author": comment.get("authorname", ""),
-                            "date": datetime.fromtimestamp(
-                                int(comment.get("datecreate", 0))
-                            ).strftime("%Y-%m-%d"),
-                            "comment_text": comment_text,
-                        })
+                async with session.get(FLICKR_REST_URL, params=params) as response:
+                    response.raise_for_status()
+                    # Parse the raw bytes directly; orjson skips the separate text decode
+                    data = _json_loads(await response.read())
 
-                time.sleep(1)  # Respect API rate limits
-            except Exception as e:
+                if data.get("stat") != "ok":
+                    raise RuntimeError(data.get("message", "unknown Flickr API error"))
+
+                return photo_id, data.get("comments", {}).get("comment", [])
+            except RuntimeError as e:
                 print(f"Error fetching comments for photo ID {photo_id}: {e}")
+            except aiohttp.ClientResponseError as e:
+                # The error text contains the request URL, and with it the API key
+                print(f"Error fetching comments for photo ID {photo_id}: HTTP {e.status}")
+            except Exception as e:
+                print(f"Error fetching comments for photo ID {photo_id}: {type(e).__name__}")
 
-        return pd.DataFrame(comment_data), photo_comment_counts
+            return photo_id, None
 
     def get_photo_details(self, photo_ids):
         """
@@ -161,10 +375,10 @@ class FlickrCollector:
         if isinstance(keywords, str):
             keywords = [keywords]
 
-        all_photo_ids = []
-        for keyword in keywords:
-            photo_ids = self.search_for_photos(keyword, start_date, end_date, num_images)
-            all_photo_ids.extend(photo_ids)
+        # Search all keywords on one shared pool; results keep keyword order
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            results = self._search_keywords(keywords, start_date, end_date, num_images, executor)
+            all_photo_ids = [photo_id for photo_ids in results for photo_id in photo_ids]
 
         # Remove duplicates while preserving order
         unique_photo_ids = list(dict.fromkeys(all_photo_ids))
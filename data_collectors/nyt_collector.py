@@ -4,6 +4,7 @@ New York Times API client for fetching articles for sentiment analysis.
 import datetime
 import time
 import pandas as pd
+import requests_cache
 from pynytimes import NYTAPI
 import config
 
@@ -11,15 +12,28 @@ class NYTCollector:
     """
     A client for collecting data from the New York Times API.
     """
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, cache_name=None, cache_expire=None):
         """
         Initialize the NYT API client.
 
         Args:
             api_key (str, optional): NYT API key. Defaults to value from config.
+            cache_name (str, optional): Name of the SQLite response cache.
+                Defaults to value from config.
+            cache_expire (int, optional): Seconds before cached responses expire.
+                Defaults to value from config.
         """
         self.api_key = api_key or config.NYT_API_KEY
-        self.nyt = NYTAPI(self.api_key, parse_dates=True)
+
+        # Repeated searches are served from disk; the key is kept out of the cache
+        session = requests_cache.CachedSession(
+            cache_name or config.NYT_CACHE_NAME,
+            backend='sqlite',
+            expire_after=cache_expire or config.NYT_CACHE_EXPIRE,
+            cache_control=True,
+            ignored_parameters=['api-key']
+        )
+        self.nyt = NYTAPI(self.api_key, session=session, parse_dates=True)
 
     def search_articles(self, query, start_date, end_date, max_results=25):
         """
@@ -67,28 +81,30 @@ class NYTCollector:
         Returns:
             pandas.DataFrame: DataFrame of extracted article data.
         """
-        article_data = []
+        columns = ['headline', 'lead_paragraph', 'abstract', 'keywords', 'pub_date', 'url',
+                   'source', 'document_type', 'news_desk', 'section_name']
+        rows = []
 
         for article in articles:
             try:
-                data = {
-                    'headline': article.get('headline', {}).get('main', ''),
-                    'lead_paragraph': article.get('lead_paragraph', ''),
-                    'abstract': article.get('abstract', ''),
-                    'keywords': ', '.join([kw.get('value', '') for kw in article.get('keywords', [])]),
-                    'pub_date': article.get('pub_date', ''),
-                    'url': article.get('web_url', ''),
-                    'source': article.get('source', ''),
-                    'document_type': article.get('document_type', ''),
-                    'news_desk': article.get('news_desk', ''),
-                    'section_name': article.get('section_name', '')
-                }
-                article_data.append(data)
+                rows.append((
+                    (article.get('headline') or {}).get('main', ''),
+                    article.get('lead_paragraph', ''),
+                    article.get('abstract', ''),
+                    ', '.join(kw.get('value', '') for kw in article.get('keywords') or []),
+                    article.get('pub_date', ''),
+                    article.get('web_url', ''),
+                    article.get('source', ''),
+                    article.get('document_type', ''),
+                    article.get('news_desk', ''),
+                    article.get('section_name', '')
+                ))
             except Exception as e:
                 print(f"Error processing article: {e}")
                 continue
 
-        return pd.DataFrame(article_data)
+        # Build the frame from plain tuples in one call rather than one dict per article
+        return pd.DataFrame.from_records(rows, columns=columns)
 
     def collect_data(self, keywords, start_date, end_date, max_results=25):
         """
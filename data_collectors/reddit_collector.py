@@ -2,7 +2,12 @@
 Reddit data collector for sentiment analysis.
 This module processes pre-downloaded Reddit data as we're not using the live API.
 """
+import os
+import re
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 
 class RedditCollector:
     """
@@ -34,13 +39,49 @@ class RedditCollector:
         file_path = data_file or self.data_file
 
         try:
-            df = pd.read_csv(file_path)
+            table = self._read_table(file_path)
+
+            # Arrow-backed columns let string filters run in Arrow's compute kernels
+            df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
             self.data = df
             return df
         except Exception as e:
             print(f"Error loading Reddit data: {e}")
             return pd.DataFrame()
 
+    def _read_table(self, file_path):
+        """
+        Read the CSV into an Arrow table, reusing a Parquet copy when it is current.
+
+        Args:
+            file_path (str): Path to the Reddit CSV file.
+
+        Returns:
+            pyarrow.Table: Parsed data.
+        """
+        parquet_path = os.path.splitext(file_path)[0] + '.parquet'
+        if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path):
+            return pq.read_table(parquet_path)
+
+        # Multi-threaded Arrow parser; comment bodies may span several lines
+        table = pa_csv.read_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(use_threads=True),
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={'self_text': pa.string()},
+                timestamp_parsers=[pa_csv.ISO8601, '%Y-%m-%d %H:%M:%S']
+            )
+        )
+
+        # Save a Parquet copy next to the CSV for faster subsequent loads
+        try:
+            pq.write_table(table, parquet_path)
+        except OSError as e:
+            print(f"Could not write Parquet cache {parquet_path}: {e}")
+
+        return table
+
     def filter_data(self, start_date=None, end_date=None, keywords=None):
         """
         Filter the Reddit data based on date range and keywords.
@@ -57,18 +98,23 @@ class RedditCollector:
             print("No data loaded. Call load_data() first.")
             return pd.DataFrame()
 
-        filtered_df = self.data.copy()
+        data = self.data
 
-        # Convert created_time to datetime if it's not already
-        if 'created_time' in filtered_df.columns and not pd.api.types.is_datetime64_any_dtype(filtered_df['created_time']):
-            filtered_df['created_time'] = pd.to_datetime(filtered_df['created_time'])
+        # Build one row mask instead of copying and re-slicing the full frame
+        mask = pd.Series(True, index=data.index)
 
-        # Filter by date range
-        if start_date and 'created_time' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['created_time'] >= start_date]
-
-        if end_date and 'created_time' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['created_time'] <= end_date]
+        # Convert created_time to datetime if it's not already
+        created_time = None
+        if 'created_time' in data.columns:
+            created_time = data['created_time']
+            if not pd.api.types.is_datetime64_any_dtype(created_time):
+                created_time = pd.to_datetime(created_time)
+
+            # Filter by date range
+            if start_date:
+                mask &= created_time >= start_date
+            if end_date:
+                mask &= created_time <= end_date
 
         # Filter by keywords
         if keywords:
@@ -76,15 +122,19 @@ class RedditCollector:
                 keywords = [keywords]
 
             # Filter comments containing any of the keywords (case-insensitive)
-            if 'self_text' in filtered_df.columns:
-                keyword_filter = filtered_df['self_text'].str.contains('|'.join(keywords), case=False, na=False)
-                filtered_df = filtered_df[keyword_filter]
+            if 'self_text' in data.columns:
+                pattern = '|'.join(map(re.escape, keywords))
+                mask &= data['self_text'].str.contains(pattern, case=False, na=False)
 
         # Extract relevant columns
         relevant_columns = ['self_text', 'created_time']
-        available_columns = [col for col in relevant_columns if col in filtered_df.columns]
+        available_columns = [col for col in relevant_columns if col in data.columns]
+
+        filtered_df = data.loc[mask, available_columns]
+        if created_time is not None:
+            filtered_df['created_time'] = created_time[mask]
 
-        return filtered_df[available_columns]
+        return filtered_df
 
     def collect_data(self, data_file, start_date=None, end_date=None, keywords=None):
         """
@@ -6,6 +6,7 @@ from .helpers import (
     standardize_dataframe,
     clean_html,
     extract_keywords,
+    extract_keywords_series,
     merge_dataframes
 )
 
@@ -13,5 +14,6 @@ __all__ = [
     'standardize_dataframe',
     'clean_html',
     'extract_keywords',
+    'extract_keywords_series',
     'merge_dataframes'
 ]
\ No newline at end of file
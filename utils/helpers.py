@@ -1,11 +1,61 @@
 """
 Helper utilities for SpectraNLP.
 """
+import numpy as np
 import pandas as pd
 import re
+from pandas.api.types import union_categoricals
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 import html
 
+# (text column, date column) produced by each data collector
+_SOURCE_COLUMNS = {
+    'Flickr': ('comment_text', 'date'),
+    'NYT': ('lead_paragraph', 'pub_date'),
+    'Reddit': ('text', 'created_time'),
+}
+
+def _parse_dates(dates):
+    """
+    Parse a date column on pandas' vectorized paths.
+
+    Args:
+        dates (pandas.Series): Datetimes, Unix timestamps or date strings; ISO 8601
+            strings take the fast path.
+
+    Returns:
+        pandas.Series: Datetime series with NaT for values that could not be parsed.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+
+    # Unix timestamps in seconds
+    if pd.api.types.is_numeric_dtype(dates):
+        return pd.to_datetime(dates, unit='s', errors='coerce')
+
+    try:
+        parsed = pd.to_datetime(dates, format='ISO8601', errors='coerce', cache=True)
+    except ValueError:
+        # Mixed UTC offsets can only share a column once converted to UTC
+        parsed = pd.to_datetime(dates, format='ISO8601', errors='coerce', cache=True, utc=True)
+
+    # Other formats ('01/02/2024', 'Jan 2, 2024', ...) are parsed by inference, value by value
+    failed = parsed.isna() & dates.notna()
+    if failed.any():
+        utc = parsed.dt.tz is not None
+        try:
+            retried = pd.to_datetime(dates[failed], format='mixed', errors='coerce', utc=utc)
+        except ValueError:
+            retried = pd.to_datetime(dates[failed], format='mixed', errors='coerce', utc=True)
+        if not utc and retried.dt.tz is not None:
+            retried = retried.dt.tz_convert('UTC').dt.tz_localize(None)
+        parsed = parsed.copy()
+        parsed[failed] = retried
+
+    return parsed
+
 def standardize_dataframe(df, source, text_col=None, date_col=None):
     """
     Standardize DataFrame columns for consistent processing.
@@ -22,10 +72,20 @@ def standardize_dataframe(df, source, text_col=None, date_col=None):
     if df.empty:
         return pd.DataFrame(columns=['text', 'date', 'source'])
 
-    result = df.copy()
+    # Shallow copy: columns are renamed, replaced or added without duplicating the data
+    result = df.copy(deep=False)
 
-    # Add source column
-    result['source'] = source
+    # Add source column; a single-category categorical stores one byte per row
+    result['source'] = pd.Categorical.from_codes(
+        np.zeros(len(result), dtype=np.int8), categories=[source]
+    )
+
+    # Known sources have fixed columns; other frames fall back to column sniffing
+    known_text_col, known_date_col = _SOURCE_COLUMNS.get(source, (None, None))
+    if known_text_col in df.columns:
+        text_col = text_col or known_text_col
+    if known_date_col in df.columns:
+        date_col = date_col or known_date_col
 
     # Determine text column
     if text_col:
@@ -64,27 +124,24 @@ def standardize_dataframe(df, source, text_col=None, date_col=None):
         # If we couldn't find a text column, create an empty one
         result['text'] = ''
 
+    # Store text as Arrow-backed strings so .str operations run in C++ kernels
+    result['text'] = result['text'].astype('string[pyarrow]')
+
     # Standardize date column
     if date_column and date_column in df.columns:
         result.rename(columns={date_column: 'date'}, inplace=True)
 
-        # Convert to datetime
-        if not pd.api.types.is_datetime64_any_dtype(result['date']):
-            try:
-                result['date'] = pd.to_datetime(result['date'])
-            except:
-                pass
+        # Convert to datetime; unparseable values fall back to the current date
+        dates = _parse_dates(result['date'])
+        missing = dates.isna().sum()
+        if missing:
+            print(f"{missing} unparseable or missing {source} dates set to the current date")
+            dates = dates.fillna(pd.Timestamp.now(tz=dates.dt.tz))
+        result['date'] = dates
     elif 'date' not in result.columns:
         # If we couldn't find a date column, use current date
         result['date'] = datetime.now()
 
-    # Ensure date is in consistent format
-    if 'date' in result.columns:
-        try:
-            result['date'] = pd.to_datetime(result['date'])
-        except:
-            result['date'] = datetime.now()
-
     # Keep only necessary columns
     required_columns = ['text', 'date', 'source']
     optional_columns = ['author', 'sentiment', 'sentiment_score', 'emotion_words']
@@ -92,6 +149,14 @@ def standardize_dataframe(df, source, text_col=None, date_col=None):
 
     return result[available_columns]
 
+# Tags handled by clean_html, in priority order; the last group catches any other tag
+_HTML_TAG_RE = re.compile(
+    r'(<br\s*/?>)|(<p\s*/?>)|(</p>)|(<div\s*/?>)|(</div>)|(<li\s*/?>)|(</li>)|(<ul\s*/?>)|(</ul>)|(<[^>]+>)'
+)
+_HTML_TAG_REPLACEMENTS = ['\n', '\n\n', '', '\n', '', '\n• ', '', '\n', '\n', ' ']
+_WS_RE = re.compile(r'\s+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+
 def clean_html(html_content):
     """
     Clean HTML content by removing tags but preserving structure.
@@ -108,26 +173,21 @@ def clean_html(html_content):
     # Unescape HTML entities
     text = html.unescape(html_content)
 
-    # Replace common tags with newlines or spaces to preserve structure
-    text = re.sub(r'<br\s*/?>', '\n', text)
-    text = re.sub(r'<p\s*/?>', '\n\n', text)
-    text = re.sub(r'</p>', '', text)
-    text = re.sub(r'<div\s*/?>', '\n', text)
-    text = re.sub(r'</div>', '', text)
-    text = re.sub(r'<li\s*/?>', '\n• ', text)
-    text = re.sub(r'</li>', '', text)
-    text = re.sub(r'<ul\s*/?>', '\n', text)
-    text = re.sub(r'</ul>', '\n', text)
-
-    # Remove all remaining HTML tags
-    text = re.sub(r'<[^>]+>', ' ', text)
+    # Replace common tags with newlines or spaces to preserve structure, and remove
+    # all remaining HTML tags, in a single pass
+    text = _HTML_TAG_RE.sub(lambda m: _HTML_TAG_REPLACEMENTS[m.lastindex - 1], text)
 
     # Fix whitespace
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'\n\s*\n', '\n\n', text)
+    text = _WS_RE.sub(' ', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text)
 
     return text.strip()
 
+@lru_cache(maxsize=None)
+def _keyword_pattern(min_length):
+    """Compiled word pattern for extract_keywords, one per minimum length."""
+    return re.compile(r'\b[a-zA-Z]{' + str(min_length) + r',}\b')
+
 def extract_keywords(text, num_keywords=5, min_length=3):
     """
     Extract potential keywords from text based on frequency.
@@ -144,20 +204,37 @@ def extract_keywords(text, num_keywords=5, min_length=3):
         return []
 
     # Tokenize and clean
-    words = re.findall(r'\b[a-zA-Z]{' + str(min_length) + r',}\b', text.lower())
+    words = _keyword_pattern(min_length).findall(text.lower())
 
-    # Count word frequency
-    word_counts = {}
-    for word in words:
-        if word not in word_counts:
-            word_counts[word] = 0
-        word_counts[word] += 1
+    # Count word frequency and keep the top keywords (partial selection, ties in first-seen order)
+    return [word for word, count in Counter(words).most_common(num_keywords)]
 
-    # Sort by frequency
-    keywords = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
+def extract_keywords_series(texts, num_keywords=5, min_length=3):
+    """
+    Extract the most frequent keywords across a Series of texts.
 
-    # Return top keywords
-    return [word for word, count in keywords[:num_keywords]]
+    Equivalent to extract_keywords on all texts joined together, but tokenizes
+    the column with pandas string methods on Arrow-backed strings and counts with
+    value_counts instead of calling extract_keywords per row.
+
+    Args:
+        texts (pandas.Series): Texts to extract keywords from.
+        num_keywords (int, optional): Number of keywords to extract. Defaults to 5.
+        min_length (int, optional): Minimum keyword length. Defaults to 3.
+
+    Returns:
+        list: List of extracted keywords.
+    """
+    words = (
+        texts.dropna().astype('string[pyarrow]').str.lower()
+        .str.findall(_keyword_pattern(min_length)).explode().dropna()
+    )
+
+    if words.empty:
+        return []
+
+    # value_counts keeps first-seen order among equal counts, like extract_keywords
+    return words.value_counts().head(num_keywords).index.tolist()
 
 def merge_dataframes(df_list, preserve_columns=True):
     """
@@ -178,18 +255,15 @@ def merge_dataframes(df_list, preserve_columns=True):
         return df_list[0]
 
     if preserve_columns:
-        return pd.concat(df_list, ignore_index=True)
+        return _concat_aligned(df_list)
     else:
-        # Find common columns
-        common_columns = set(df_list[0].columns)
-        for df in df_list[1:]:
-            common_columns = common_columns.intersection(set(df.columns))
+        # Find common columns, in the order of the first DataFrame
+        common_columns = set.intersection(*(set(df.columns) for df in df_list))
+        common_columns = [col for col in df_list[0].columns if col in common_columns]
 
         # Ensure at least text, date, and source columns
         required_columns = ['text', 'date', 'source']
-        for col in required_columns:
-            if col not in common_columns:
-                common_columns.add(col)
+        common_columns += [col for col in required_columns if col not in common_columns]
 
         # Merge with common columns
         result_dfs = []
@@ -197,4 +271,43 @@ def merge_dataframes(df_list, preserve_columns=True):
             available_columns = [col for col in common_columns if col in df.columns]
             result_dfs.append(df[available_columns])
 
-        return pd.concat(result_dfs, ignore_index=True)
\ No newline at end of file
+        return _concat_aligned(result_dfs)
+
+def _concat_aligned(df_list):
+    """
+    Concatenate DataFrames after aligning dtypes that pd.concat would upcast to object.
+
+    Categorical columns whose categories differ are given the union of categories,
+    and datetime columns mixing time zone aware and naive values are converted to
+    naive UTC, so neither falls back to object dtype.
+
+    Args:
+        df_list (list): DataFrames to concatenate.
+
+    Returns:
+        pandas.DataFrame: Concatenated DataFrame with a fresh RangeIndex.
+    """
+    columns = set.intersection(*(set(df.columns) for df in df_list))
+    updates = [{} for _ in df_list]
+
+    for col in columns:
+        parts = [df[col] for df in df_list]
+
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            categories = union_categoricals(
+                [pd.Categorical([], categories=part.cat.categories) for part in parts],
+                ignore_order=True
+            ).categories
+            for update, part in zip(updates, parts):
+                if not part.cat.categories.equals(categories):
+                    update[col] = part.cat.set_categories(categories)
+
+        elif all(pd.api.types.is_datetime64_any_dtype(part) for part in parts):
+            zones = {str(part.dt.tz) for part in parts}
+            if len(zones) > 1:
+                for update, part in zip(updates, parts):
+                    if part.dt.tz is not None:
+                        update[col] = part.dt.tz_convert('UTC').dt.tz_localize(None)
+
+    aligned = [df.assign(**update) if update else df for df, update in zip(df_list, updates)]
+    return pd.concat(aligned, ignore_index=True, sort=False)
@@ -1,13 +1,26 @@
 """
 Sentiment visualization components for SpectraNLP.
 """
+import re
+from functools import lru_cache
 import pandas as pd
 import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
-from wordcloud import WordCloud
+from wordcloud import STOPWORDS, WordCloud
 import numpy as np
 
+# Same word pattern WordCloud uses when tokenizing raw text
+_WORDCLOUD_TOKEN_RE = re.compile(r"\w[\w']*")
+
+@lru_cache(maxsize=4096)
+def _compile_emotion_pattern(words):
+  """Compile a whole-word, case-insensitive alternation of words, longest first."""
+  return re.compile(
+      r'(?<!\w)(' + '|'.join(re.escape(word) for word in sorted(words, key=len, reverse=True)) + r')(?!\w)',
+      re.IGNORECASE
+  )
+
 class SentimentPlots:
   """
   Creates visualizations for sentiment analysis results.
@@ -28,9 +41,15 @@ class SentimentPlots:
       if 'sentiment' not in df.columns:
           raise ValueError("DataFrame must contain a 'sentiment' column.")
 
-      # Count sentiments
-      sentiment_counts = df['sentiment'].value_counts().reset_index()
-      sentiment_counts.columns = ['Sentiment', 'Count']
+      # Count sentiments in a fixed order; missing sentiments get a zero bar
+      sentiment_order = ['Positive', 'Neutral', 'Negative']
+      sentiment_counts = (
+          df['sentiment'].astype(pd.CategoricalDtype(sentiment_order))
+          .value_counts(sort=False)
+          .reindex(sentiment_order, fill_value=0)
+          .rename_axis('Sentiment')
+          .reset_index(name='Count')
+      )
 
       # Set color map
       color_map = {'Positive': '#4CAF50', 'Neutral': '#FFC107', 'Negative': '#F44336'}
@@ -43,6 +62,7 @@ class SentimentPlots:
           title=title,
           color='Sentiment',
           color_discrete_map=color_map,
+          category_orders={'Sentiment': sentiment_order},
           text='Count'
       )
 
@@ -74,31 +94,32 @@ class SentimentPlots:
       if 'sentiment' not in df.columns or date_col not in df.columns:
           raise ValueError(f"DataFrame must contain 'sentiment' and '{date_col}' columns.")
 
-      # Ensure date column is datetime type
-      df_copy = df.copy()
-      df_copy[date_col] = pd.to_datetime(df_copy[date_col])
+      # Ensure date column is datetime type (only the two needed columns are touched)
+      dates = pd.to_datetime(df[date_col])
 
-      # Group by date and sentiment
+      # Bucket dates into periods, keeping datetime64 values rather than Python dates
       if interval == 'D':
-          df_copy['period'] = df_copy[date_col].dt.date
-      elif interval == 'W':
-          df_copy['period'] = df_copy[date_col].dt.to_period('W').dt.start_time.dt.date
-      elif interval == 'M':
-          df_copy['period'] = df_copy[date_col].dt.to_period('M').dt.start_time.dt.date
+          period = dates.dt.normalize()
+      elif interval in ('W', 'M'):
+          period = dates.dt.to_period(interval).dt.start_time
       elif interval == 'Y':
-          df_copy['period'] = df_copy[date_col].dt.year
+          period = dates.dt.year
       else:
           raise ValueError("Interval must be one of: 'D', 'W', 'M', 'Y'")
 
-      # Count sentiments by period
-      sentiment_over_time = df_copy.groupby(['period', 'sentiment']).size().reset_index(name='count')
+      # Count sentiments by period in one pass (periods x sentiments, zero-filled)
+      sentiment_over_time = pd.crosstab(period.rename('period'), df['sentiment']).astype(np.int32)
+      sentiment_order = [s for s in ['Positive', 'Neutral', 'Negative'] if s in sentiment_over_time.columns]
+      sentiment_order += [s for s in sentiment_over_time.columns if s not in sentiment_order]
+      sentiment_over_time = sentiment_over_time[sentiment_order]
+      sentiment_over_time.columns = sentiment_over_time.columns.astype(str)
 
-      # Create line chart
+      # Create line chart from the wide table, one line per sentiment column
       fig = px.line(
           sentiment_over_time,
-          x='period',
-          y='count',
-          color='sentiment',
+          x=sentiment_over_time.index,
+          y=list(sentiment_over_time.columns),
+          labels={'value': 'count', 'variable': 'sentiment'},
           title=title,
           color_discrete_map={'Positive': '#4CAF50', 'Neutral': '#FFC107', 'Negative': '#F44336'}
       )
@@ -142,12 +163,36 @@ class SentimentPlots:
       else:
           filtered_df = df
 
-      # Combine all text
-      all_text = ' '.join(filtered_df[text_col].dropna().astype(str))
+      # Count words per text instead of joining everything into one string for
+      # WordCloud to re-tokenize. Stopwords, numbers, possessives and plurals are
+      # handled like WordCloud's defaults; words are lowercased and two-word
+      # collocations are not counted
+      words = (
+          filtered_df[text_col].dropna().astype(str).str.lower()
+          .str.findall(_WORDCLOUD_TOKEN_RE).explode().dropna()
+          .str.removesuffix("'s")
+      )
+      words = words[~words.isin(STOPWORDS) & ~words.str.isdigit()]
 
-      if not all_text:
+      if words.empty:
           raise ValueError("No valid text found for word cloud generation.")
 
+      counts = words.value_counts()
+
+      # Fold plurals into their singular when both occur ('protests' -> 'protest'),
+      # as WordCloud's normalize_plurals does
+      words_index = counts.index.astype(str)
+      is_plural = words_index.str.endswith('s') & ~words_index.str.endswith('ss')
+      singulars = words_index[is_plural].str[:-1]
+      merge = singulars.isin(words_index)
+      if merge.any():
+          plurals = words_index[is_plural][merge]
+          counts = counts.drop(plurals).add(
+              pd.Series(counts[plurals].to_numpy(), index=singulars[merge]), fill_value=0
+          ).astype(np.int64).sort_values(ascending=False, kind='stable')
+
+      frequencies = counts.head(max_words).to_dict()
+
       # Generate word cloud
       wordcloud = WordCloud(
           width=800,
@@ -157,7 +202,7 @@ class SentimentPlots:
           colormap='viridis',
           contour_width=1,
           contour_color='steelblue'
-      ).generate(all_text)
+      ).generate_from_frequencies(frequencies)
 
       # Create figure
       fig, ax = plt.subplots(figsize=(10, 6))
@@ -199,14 +244,24 @@ class SentimentPlots:
       else:
           color = '#FFC107'  # Yellow/Amber
 
-      highlighted_text = text
+      # Highlight all emotion words in a single pass
+      return SentimentPlots.emotion_words_pattern(emotion_words).sub(
+          lambda m: f'<span style="background-color: {color}; padding: 1px 3px; border-radius: 2px;">{m.group(0)}</span>',
+          text
+      )
 
-      # Highlight each emotion word
-      for word in sorted(emotion_words, key=len, reverse=True):
-          if word in highlighted_text:
-              highlighted_text = highlighted_text.replace(
-                  word,
-                  f'<span style="background-color: {color}; padding: 1px 3px; border-radius: 2px;">{word}</span>'
-              )
+  @staticmethod
+  def emotion_words_pattern(emotion_words):
+      """
+      Get a compiled pattern matching any of the emotion words as whole words.
 
-      return highlighted_text
\ No newline at end of file
+      Patterns are cached per distinct word set, so samples sharing the same
+      emotion words reuse one compiled regex.
+
+      Args:
+          emotion_words (list): Emotion words to match (case-insensitive).
+
+      Returns:
+          re.Pattern: Pattern matching the longest emotion word at each position.
+      """
+      return _compile_emotion_pattern(frozenset(emotion_words))
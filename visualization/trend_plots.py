@@ -1,11 +1,105 @@
 """
 Trend visualization components for SpectraNLP.
 """
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+try:
+  import hyperscan
+except ImportError:  # hyperscan is optional
+  hyperscan = None
+
+# Minimum number of keywords before one multi-pattern hyperscan pass beats
+# one Arrow substring scan per keyword
+_HYPERSCAN_MIN_KEYWORDS = 50
+
+# Minimum number of texts before keyword scanning is split across processes
+_PARALLEL_MIN_ROWS = 50_000
+
+# Number of time periods from which sentiment intensity switches to WebGL traces
+_WEBGL_MIN_POINTS = 1000
+
+def _keyword_matrix(texts, keywords, n_jobs=None):
+  """
+  Build a (texts x keywords) matrix of literal substring matches.
+
+  Args:
+      texts (pandas.Series): Lowercased Arrow-backed texts.
+      keywords (list): Lowercased keywords.
+      n_jobs (int, optional): Number of worker processes for large inputs.
+          Defaults to the CPU count.
+
+  Returns:
+      numpy.ndarray: Boolean matrix, True where a text contains a keyword.
+  """
+  n_jobs = n_jobs or os.cpu_count() or 1
+  if n_jobs == 1 or len(texts) < _PARALLEL_MIN_ROWS or not keywords:
+      return _scan_keywords(texts, keywords)
+
+  # Scan contiguous chunks in parallel; stacking them restores the row order
+  bounds = np.linspace(0, len(texts), n_jobs + 1, dtype=np.int64)
+  chunks = [texts.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+  with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+      return np.vstack(list(executor.map(_scan_keywords, chunks, [keywords] * len(chunks))))
+
+def _scan_keywords(texts, keywords):
+  """Single-process implementation of _keyword_matrix."""
+  if hyperscan is not None and len(keywords) >= _HYPERSCAN_MIN_KEYWORDS and all(keywords):
+      return _keyword_matrix_hyperscan(texts, keywords)
+
+  if not keywords:
+      return np.zeros((len(texts), 0), dtype=bool)
+
+  return np.column_stack([
+      texts.str.contains(keyword, regex=False).fillna(False).to_numpy(dtype=bool)
+      for keyword in keywords
+  ])
+
+@lru_cache(maxsize=32)
+def _hyperscan_database(keywords):
+  """Compile a hyperscan database for a tuple of keywords, once per keyword set."""
+  database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+  database.compile(
+      expressions=[re.escape(keyword).encode() for keyword in keywords],
+      ids=list(range(len(keywords))),
+      elements=len(keywords),
+      flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(keywords)
+  )
+  return database
+
+def _keyword_matrix_hyperscan(texts, keywords):
+  """Match all keywords in a single pass per text with a compiled hyperscan database."""
+  database = _hyperscan_database(tuple(keywords))
+
+  hits = np.zeros((len(texts), len(keywords)), dtype=bool)
+
+  def on_match(keyword_id, start, end, flags, row):
+      hits[row, keyword_id] = True
+
+  for row, text in enumerate(texts.fillna('')):
+      if text:
+          database.scan(text.encode(), match_event_handler=on_match, context=row)
+
+  return hits
+
+def _month_start(dates):
+  """Floor dates to the first of their month; naive dates take a numpy datetime64[M] cast."""
+  if dates.dt.tz is not None:
+      return dates.dt.to_period('M').dt.start_time
+  return pd.Series(dates.to_numpy().astype('datetime64[M]'), index=dates.index)
+
+# Interval code -> function bucketing a datetime Series into period labels
+_PERIOD_FLOORS = {
+  'D': lambda dates: dates.dt.normalize(),
+  # numpy weeks start on Thursday, so weeks go through pandas periods
+  'W': lambda dates: dates.dt.to_period('W').dt.start_time,
+  'M': _month_start,
+  'Y': lambda dates: dates.dt.year,
+}
 
 class TrendPlots:
   """
@@ -24,24 +118,45 @@ class TrendPlots:
       Returns:
           plotly.graph_objects.Figure: Plotly figure object.
       """
-      # Prepare data
-      combined_data = []
+      # Prepare data: one row of sentiment counts per source, in a fixed order
+      sentiment_order = ['Positive', 'Neutral', 'Negative']
 
+      source_names = []
+      codes = []
       for source_name, df in data_sources.items():
           if 'sentiment' not in df.columns:
               continue
 
-          sentiment_counts = df['sentiment'].value_counts().reset_index()
-          sentiment_counts.columns = ['Sentiment', 'Count']
-          sentiment_counts['Source'] = source_name
-          sentiment_counts['Percentage'] = sentiment_counts['Count'] / sentiment_counts['Count'].sum() * 100
-
-          combined_data.append(sentiment_counts)
+          source_names.append(source_name)
+          # Recode by label: astype to a CategoricalDtype with the same categories in
+          # another order is a no-op, and would keep analyze_dataframe's codes
+          codes.append(pd.Categorical(df['sentiment'], categories=sentiment_order).codes)
 
-      if not combined_data:
+      if not codes:
           raise ValueError("No valid sentiment data found in data sources.")
 
-      combined_df = pd.concat(combined_data, ignore_index=True)
+      # Count every (source, sentiment) pair in one bincount over all sources;
+      # values outside the three sentiments have code -1 and are dropped
+      source_ids = np.repeat(np.arange(len(codes)), [len(source_codes) for source_codes in codes])
+      codes = np.concatenate(codes)
+      valid = codes >= 0
+      counts = np.bincount(
+          source_ids[valid] * len(sentiment_order) + codes[valid],
+          minlength=len(source_names) * len(sentiment_order)
+      ).reshape(len(source_names), len(sentiment_order))
+      totals = counts.sum(axis=1, keepdims=True)
+      percentages = np.divide(counts * 100.0, totals, out=np.zeros(counts.shape), where=totals > 0)
+
+      # Tidy frame (source x sentiment) built straight from the arrays
+      combined_df = pd.DataFrame({
+          'Sentiment': np.tile(sentiment_order, len(source_names)),
+          'Count': counts.ravel(),
+          'Source': np.repeat(source_names, len(sentiment_order)),
+          'Percentage': percentages.ravel(),
+      })
+
+      # Plotting libraries are slow to import; load them only once there is data to draw
+      import plotly.express as px
 
       # Create grouped bar chart
       fig = px.bar(
@@ -52,6 +167,7 @@ class TrendPlots:
           title=title,
           color_discrete_map={'Positive': '#4CAF50', 'Neutral': '#FFC107', 'Negative': '#F44336'},
           barmode='group',
+          category_orders={'Sentiment': sentiment_order},
           text_auto='.1f'
       )
 
@@ -67,7 +183,8 @@ class TrendPlots:
       return fig
 
   @staticmethod
-  def plot_keyword_comparison(df, keywords, text_col='text', title="Keyword Sentiment Comparison"):
+  def plot_keyword_comparison(df, keywords, text_col='text', title="Keyword Sentiment Comparison",
+                              n_jobs=None):
       """
       Create a heatmap comparing sentiment across different keywords.
 
@@ -76,6 +193,8 @@ class TrendPlots:
           keywords (list): List of keywords to analyze.
           text_col (str, optional): Name of the text column. Defaults to 'text'.
           title (str, optional): Plot title. Defaults to "Keyword Sentiment Comparison".
+          n_jobs (int, optional): Number of worker processes used to scan large text
+              columns. Defaults to the CPU count.
 
       Returns:
           matplotlib.figure.Figure: Matplotlib figure with the heatmap.
@@ -83,45 +202,54 @@ class TrendPlots:
       if text_col not in df.columns or 'sentiment' not in df.columns:
           raise ValueError(f"DataFrame must contain '{text_col}' and 'sentiment' columns.")
 
-      # Prepare data
-      keyword_sentiment = pd.DataFrame(index=keywords, columns=['Positive', 'Neutral', 'Negative'])
-
-      for keyword in keywords:
-          # Filter texts containing the keyword
-          keyword_filter = df[text_col].str.contains(keyword, case=False, na=False)
-          filtered_df = df[keyword_filter]
-
-          if not filtered_df.empty:
-              # Calculate sentiment percentages
-              sentiment_counts = filtered_df['sentiment'].value_counts(normalize=True) * 100
+      # Prepare data: lowercase the texts once, then a literal substring match
+      # per keyword gives a (texts x keywords) membership matrix
+      sentiment_order = ['Positive', 'Neutral', 'Negative']
+      texts = df[text_col].astype('string[pyarrow]').str.lower()
+      keyword_matrix = _keyword_matrix(texts, [keyword.lower() for keyword in keywords], n_jobs)
+
+      # One-hot sentiments; a single matrix product counts sentiments per keyword
+      # Columns are aligned by label, whatever the category order of the input
+      sentiment_onehot = (
+          pd.get_dummies(df['sentiment'])
+          .reindex(columns=sentiment_order, fill_value=0)
+          .to_numpy(dtype=np.int64)
+      )
+      counts = keyword_matrix.T.astype(np.int64) @ sentiment_onehot
+      totals = counts.sum(axis=1, keepdims=True)
+
+      # Percentages per keyword; keywords without matches stay at 0
+      keyword_sentiment = pd.DataFrame(
+          np.divide(counts * 100.0, totals, out=np.zeros(counts.shape), where=totals > 0),
+          index=keywords,
+          columns=sentiment_order
+      )
 
-              # Fill in the data
-              for sentiment in ['Positive', 'Neutral', 'Negative']:
-                  keyword_sentiment.at[keyword, sentiment] = sentiment_counts.get(sentiment, 0)
-          else:
-              # If no matches, set all to 0
-              keyword_sentiment.loc[keyword] = [0, 0, 0]
+      # Plotting libraries are slow to import; load them only once there is data to draw
+      import matplotlib.pyplot as plt
+      import seaborn as sns
 
       # Create heatmap
-      plt.figure(figsize=(10, 8))
       sns.set(font_scale=1.2)
+      fig, ax = plt.subplots(figsize=(10, 8), dpi=150)
 
-      # Create heatmap
-      ax = sns.heatmap(
+      # Create heatmap on an explicit Axes rather than pyplot's current figure
+      sns.heatmap(
           keyword_sentiment,
           annot=True,
           fmt='.1f',
           cmap='RdYlGn',
           linewidths=0.5,
-          cbar_kws={'label': 'Percentage (%)'}
+          cbar_kws={'label': 'Percentage (%)'},
+          rasterized=True,  # One bitmap for the cells instead of a vector path per cell
+          ax=ax
       )
 
-      plt.title(title, fontsize=16)
-      plt.xlabel('Sentiment', fontsize=14)
-      plt.ylabel('Keyword', fontsize=14)
+      ax.set_title(title, fontsize=16)
+      ax.set_xlabel('Sentiment', fontsize=14)
+      ax.set_ylabel('Keyword', fontsize=14)
 
-      fig = plt.gcf()
-      plt.tight_layout()
+      fig.tight_layout()
 
       return fig
 
@@ -145,81 +273,84 @@ class TrendPlots:
       if score_col not in df.columns or date_col not in df.columns:
           raise ValueError(f"DataFrame must contain '{score_col}' and '{date_col}' columns.")
 
-      # Ensure date column is datetime type
-      df_copy = df.copy()
-      df_copy[date_col] = pd.to_datetime(df_copy[date_col])
-
-      # Group by date
-      if interval == 'D':
-          df_copy['period'] = df_copy[date_col].dt.date
-      elif interval == 'W':
-          df_copy['period'] = df_copy[date_col].dt.to_period('W').dt.start_time.dt.date
-      elif interval == 'M':
-          df_copy['period'] = df_copy[date_col].dt.to_period('M').dt.start_time.dt.date
-      elif interval == 'Y':
-          df_copy['period'] = df_copy[date_col].dt.year
-      else:
-          raise ValueError("Interval must be one of: 'D', 'W', 'M', 'Y'")
+      # Look up the bucketing function before touching the data
+      try:
+          floor = _PERIOD_FLOORS[interval]
+      except KeyError:
+          raise ValueError("Interval must be one of: 'D', 'W', 'M', 'Y'") from None
+
+      # Parse dates without copying the frame
+      dates = pd.to_datetime(df[date_col], errors='coerce')
+
+      # Bucket dates into periods, keeping datetime64 values rather than Python dates
+      period = floor(dates)
 
       # Calculate average sentiment score per period
-      sentiment_intensity = df_copy.groupby('period')[score_col].agg(['mean', 'count']).reset_index()
+      sentiment_intensity = (
+          pd.DataFrame({'period': period, 'score': df[score_col]})
+          .groupby('period', sort=True, observed=True)['score']
+          .agg(['mean', 'count'])
+          .reset_index()
+      )
       sentiment_intensity.columns = ['period', 'avg_score', 'count']
 
+      # Display precision is enough for the values sent to the browser
+      sentiment_intensity = sentiment_intensity.astype({'avg_score': np.float32, 'count': np.int32})
+
+      # Plotting libraries are slow to import; load them only once there is data to draw
+      import plotly.graph_objects as go
+
+      # Compact trace payloads: periods are whole days
+      x = sentiment_intensity['period']
+      if pd.api.types.is_datetime64_any_dtype(x):
+          if x.dt.tz is not None:
+              x = x.dt.tz_localize(None)
+          x = x.to_numpy(dtype='datetime64[D]')
+      else:
+          x = x.to_numpy()
+      y = sentiment_intensity['avg_score'].to_numpy()
+
+      # Long series are drawn with WebGL rather than as SVG paths
+      scatter = go.Scattergl if len(x) >= _WEBGL_MIN_POINTS else go.Scatter
+
       # Create line chart
       fig = go.Figure()
 
       # Add main line for average sentiment
-      fig.add_trace(go.Scatter(
-          x=sentiment_intensity['period'],
-          y=sentiment_intensity['avg_score'],
+      fig.add_trace(scatter(
+          x=x,
+          y=y,
           mode='lines+markers',
           name='Average Sentiment',
           line=dict(color='royalblue', width=3),
           marker=dict(size=8),
       ))
 
-      # Add reference line at 0
-      fig.add_shape(
-          type="line",
-          x0=sentiment_intensity['period'].min(),
-          y0=0,
-          x1=sentiment_intensity['period'].max(),
-          y1=0,
-          line=dict(color="gray", width=1, dash="dot"),
-      )
-
-      # Add colored regions for positive and negative sentiment
-      fig.add_trace(go.Scatter(
-          x=sentiment_intensity['period'],
-          y=[0] * len(sentiment_intensity),
-          fill=None,
-          mode='lines',
-          line=dict(color='rgba(0,0,0,0)'),
-          showlegend=False
-      ))
+      # Add reference line at 0; with no valid dates the figure is left empty
+      if len(x):
+          fig.add_shape(
+              type="line",
+              x0=x.min(),
+              y0=0,
+              x1=x.max(),
+              y1=0,
+              line=dict(color="gray", width=1, dash="dot"),
+          )
 
-      fig.add_trace(go.Scatter(
-          x=sentiment_intensity['period'],
-          y=sentiment_intensity['avg_score'],
-          fill='tonexty',
+      # Add colored regions for positive and negative sentiment, each filled to zero
+      fig.add_trace(scatter(
+          x=x,
+          y=np.maximum(y, 0),
+          fill='tozeroy',
           mode='none',
           fillcolor='rgba(76, 175, 80, 0.3)',  # Green for positive
           name='Positive Sentiment Zone'
       ))
 
-      fig.add_trace(go.Scatter(
-          x=sentiment_intensity['period'],
-          y=[0] * len(sentiment_intensity),
-          fill=None,
-          mode='lines',
-          line=dict(color='rgba(0,0,0,0)'),
-          showlegend=False
-      ))
-
-      fig.add_trace(go.Scatter(
-          x=sentiment_intensity['period'],
-          y=[min(0, score) for score in sentiment_intensity['avg_score']],
-          fill='tonexty',
+      fig.add_trace(scatter(
+          x=x,
+          y=np.minimum(y, 0),
+          fill='tozeroy',
           mode='none',
           fillcolor='rgba(244, 67, 54, 0.3)',  # Red for negative
           name='Negative Sentiment Zone'
@@ -244,4 +375,5 @@ class TrendPlots:
           )
       )
 
-      return fig
\ No newline at end of file
+      return fig
+